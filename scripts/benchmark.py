@@ -1,9 +1,10 @@
-import urllib.request
-import urllib.error
-import json
+import argparse
+import multiprocessing
 import time
-import statistics
-import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
 
 # Configuration
 BASE_URL = "http://localhost:8080/api"
@@ -15,8 +16,30 @@ GREEN = '\033[92m'
 RESET = '\033[0m'
 RED = '\033[91m'
 
+def _worker_latencies(shard):
+    """Run one worker's share of iterations on its own session (child process)."""
+    method, url, data, headers, iterations = shard
+    session = requests.Session()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, json=data, headers=headers, timeout=10)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+        except requests.RequestException:
+            pass
+    return latencies
+
+
 class Benchmark:
-    def __init__(self):
+    def __init__(self, rps=None, procs=1):
+        # Worker process count; >1 sidesteps the GIL at high concurrency
+        self.procs = procs
+        # Target request rate for serial tests; None = closed loop (full speed)
+        self.rps = rps
+        # Keep-alive session: iterations measure the server, not TCP handshakes
+        self.session = requests.Session()
         self.token = None
         self.headers = {"Content-Type": "application/json"}
         self.admin_user = f"bench_admin_{int(time.time())}"
@@ -25,25 +48,15 @@ class Benchmark:
 
     def _request(self, method, endpoint, data=None):
         url = f"{BASE_URL}{endpoint}"
-        req = urllib.request.Request(url, method=method)
-        
-        for k, v in self.headers.items():
-            req.add_header(k, v)
-            
-        if data:
-            json_data = json.dumps(data).encode('utf-8')
-            req.add_header("Content-Length", len(json_data))
-        else:
-            json_data = None
-
         start = time.perf_counter()
         try:
-            with urllib.request.urlopen(req, data=json_data) as response:
-                payload = response.read().decode('utf-8')
-                end = time.perf_counter()
-                return (end - start) * 1000, json.loads(payload) if payload else {}
-        except urllib.error.HTTPError as e:
-            print(f"{RED}Error {e.code} on {endpoint}: {e.read().decode()}{RESET}")
+            response = self.session.request(method, url, json=data,
+                                            headers=self.headers, timeout=10)
+            response.raise_for_status()
+            end = time.perf_counter()
+            return (end - start) * 1000, response.json() if response.content else {}
+        except requests.HTTPError as e:
+            print(f"{RED}Error {e.response.status_code} on {endpoint}: {e.response.text}{RESET}")
             return None, None
 
     def setup(self):
@@ -81,30 +94,60 @@ class Benchmark:
         print(f" - Created Game: {self.test_game_id}")
         print("-" * 50)
 
-    def run_test(self, name, method, endpoint, payload=None):
+    def run_test(self, name, method, endpoint, payload=None, concurrency=1):
         print(f"Running: {name:<30}", end="", flush=True)
-        
+
         # Warmup
         for _ in range(WARMUP):
             self._request(method, endpoint, payload)
-            
+
         latencies = []
-        for _ in range(ITERATIONS):
-            latency, _ = self._request(method, endpoint, payload)
-            if latency is not None:
-                latencies.append(latency)
-            time.sleep(0.05) # Small sleep to prevent DoS-ing self
-
-        avg = statistics.mean(latencies)
-        p99 = statistics.quantiles(latencies, n=100)[98] # Approx P99
-        print(f"| Avg: {avg:6.2f}ms | P99: {p99:6.2f}ms")
-        
+        wall_start = time.perf_counter()
+        if self.procs > 1:
+            # Shard iterations across processes, each with its own session and
+            # connection pool, so client-side GIL contention can't cap QPS
+            per_proc = max(1, ITERATIONS // self.procs)
+            shards = [(method, f"{BASE_URL}{endpoint}", payload,
+                       dict(self.headers), per_proc)] * self.procs
+            with multiprocessing.Pool(self.procs) as pool:
+                for worker_latencies in pool.map(_worker_latencies, shards):
+                    latencies.extend(worker_latencies)
+        elif concurrency > 1:
+            # Open-loop fire of all iterations across workers: measures how
+            # the server behaves under contention, not single-client latency
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(self._request, method, endpoint, payload)
+                           for _ in range(ITERATIONS)]
+                for future in futures:
+                    latency, _ = future.result()
+                    if latency is not None:
+                        latencies.append(latency)
+        else:
+            for i in range(ITERATIONS):
+                if self.rps:
+                    # Open-loop pacing: send at fixed offsets from the start
+                    # rather than a fixed sleep after each response
+                    next_send = wall_start + i / self.rps
+                    time.sleep(max(0.0, next_send - time.perf_counter()))
+                latency, _ = self._request(method, endpoint, payload)
+                if latency is not None:
+                    latencies.append(latency)
+        wall = time.perf_counter() - wall_start
+
+        lat = np.asarray(latencies, dtype=np.float64)
+        avg = float(lat.mean())
+        p99 = float(np.percentile(lat, 99, method='lower'))
+        throughput = lat.size / wall
+        print(f"| Avg: {avg:6.2f}ms | P99: {p99:6.2f}ms | {throughput:7.1f} req/s (c={concurrency})")
+
         return {
             "name": name,
             "avg": avg,
             "p99": p99,
-            "min": min(latencies),
-            "max": max(latencies)
+            "min": float(lat.min()),
+            "max": float(lat.max()),
+            "throughput": throughput,
+            "concurrency": concurrency
         }
 
     def execute(self):
@@ -114,11 +157,18 @@ class Benchmark:
         
         # --- SIMPLE READS ---
         results.append(self.run_test(
-            "Simple Read (Game Details)", 
-            "GET", 
+            "Simple Read (Game Details)",
+            "GET",
             f"/games/{self.test_game_id}"
         ))
 
+        results.append(self.run_test(
+            "Simple Read (Conc=16)",
+            "GET",
+            f"/games/{self.test_game_id}",
+            concurrency=16
+        ))
+
         # --- WRITES ---
         results.append(self.run_test(
             "Write (Create Review)", 
@@ -174,15 +224,15 @@ class Benchmark:
         print("="*50)
         print(r"\begin{table}[H]")
         print(r"\centering")
-        print(r"\begin{tabular}{|l|c|c|c|c|}")
+        print(r"\begin{tabular}{|l|c|c|c|c|c|}")
         print(r"\hline")
-        print(r"\textbf{Operation} & \textbf{Avg (ms)} & \textbf{Min (ms)} & \textbf{Max (ms)} & \textbf{P99 (ms)} \\ \hline")
-        
+        print(r"\textbf{Operation} & \textbf{Avg (ms)} & \textbf{Min (ms)} & \textbf{Max (ms)} & \textbf{P99 (ms)} & \textbf{Thru (req/s)} \\ \hline")
+
         for r in results:
             name = r['name']
             # Escape underscores for Latex
-            # name = name.replace("_", "\\_") 
-            print(f"{name} & {r['avg']:.2f} & {r['min']:.2f} & {r['max']:.2f} & {r['p99']:.2f} \\\\ \\hline")
+            # name = name.replace("_", "\\_")
+            print(f"{name} & {r['avg']:.2f} & {r['min']:.2f} & {r['max']:.2f} & {r['p99']:.2f} & {r['throughput']:.1f} \\\\ \\hline")
             
         print(r"\end{tabular}")
         print(r"\caption{System Performance Benchmarks (" + str(ITERATIONS) + r" iterations)}")
@@ -190,7 +240,13 @@ class Benchmark:
         print(r"\end{table}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GameSense API benchmark")
+    parser.add_argument("--rps", type=float, default=None,
+                        help="Pace serial tests at this request rate (default: closed loop)")
+    parser.add_argument("--procs", type=int, default=1,
+                        help="Shard iterations across N worker processes (default: 1)")
+    args = parser.parse_args()
     try:
-        Benchmark().execute()
+        Benchmark(rps=args.rps, procs=args.procs).execute()
     except Exception as e:
         print(f"\n{RED}Benchmark Failed: {e}{RESET}")
\ No newline at end of file